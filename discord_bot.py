@@ -5,6 +5,7 @@ import discord
 import json
 import logging
 import math
+import os
 import pathlib
 import re
 import time
@@ -12,7 +13,7 @@ from bot_db import BotDatabase
 from datetime import datetime, UTC
 from ipaddress import IPv6Address
 from semver import compare
-from typing import Any, Deque, Dict, Iterator, List, Optional
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
 from ztapi_client import ZeroTierApiClient
 
 logger = logging.getLogger(__name__)
@@ -28,11 +29,35 @@ config: Dict[str, Any] = {
     'log_level': 'info'
 }
 
+discord_escape_table = str.maketrans({char: '\\' + char for char in '-\\*_#|~:@[]()<>`'})
+
+
 def escape_discord_formatting_characters(text: str) -> str:
-    return re.sub(r'([-\\*_#|~:@[\]()<>`])', r'\\\1', text)
+    return text.translate(discord_escape_table)
+
+
+# most games are unchanged between updates, so rendered messages are reused as long as every field they show is the same
+game_message_cache: Dict[Tuple[Any, ...], str] = {}
+game_message_cache_size = 256
 
 
 def format_game_message(game: Dict[str, Any]) -> str:
+    key = (
+        game['id'], game['type'], game['version'], game['tick_rate'], game['difficulty'],
+        game['run_in_town'], game['full_quests'], game['theo_quest'], game['cow_quest'], game['friendly_fire'],
+        tuple(game['players']), game['timestamp'], game.get('ended'), game.get('first_seen')
+    )
+    text = game_message_cache.get(key)
+    if text is None:
+        text = _format_game_message(game)
+        if len(game_message_cache) >= game_message_cache_size:
+            del game_message_cache[next(iter(game_message_cache))]
+        game_message_cache[key] = text
+    return text
+
+
+# every field read here must also be part of the cache key in format_game_message, otherwise changes to it show stale text
+def _format_game_message(game: Dict[str, Any]) -> str:
     ended = 'ended' in game
     text = ''
     if ended:
@@ -148,35 +173,90 @@ def format_time_delta(minutes: int) -> str:
     return text
 
 
+# using the same restricted character list as DevilutionX, see
+#  https://github.com/diasurgical/devilutionX/blob/0eda8d9367e08cea08b2ad81e1ce534e927646d6/Source/DiabloUI/diabloui.cpp#L649
+# ASCII control characters or anything outside the basic latin set aren't allowed
+#  in the current DevilutionX codebase either, see
+#  https://github.com/diasurgical/devilutionX/blob/0eda8d9367e08cea08b2ad81e1ce534e927646d6/Source/DiabloUI/diabloui.cpp#L654
+invalid_player_name_pattern = re.compile(r'[,<>%&\\"?*#/: ]|[^\x20-\x7e]')
+
+
 def any_player_name_is_invalid(players: List[str]) -> bool:
-    for name in players:
-        # using the same restricted character list as DevilutionX, see
-        #  https://github.com/diasurgical/devilutionX/blob/0eda8d9367e08cea08b2ad81e1ce534e927646d6/Source/DiabloUI/diabloui.cpp#L649
-        if re.search(r'[,<>%&\\"?*#/: ]', name):
-            return True
-
-        for char in name:
-            if ord(char) < 32 or ord(char) > 126:
-                # ASCII control characters or anything outside the basic latin set aren't allowed
-                #  in the current DevilutionX codebase, see
-                #  https://github.com/diasurgical/devilutionX/blob/0eda8d9367e08cea08b2ad81e1ce534e927646d6/Source/DiabloUI/diabloui.cpp#L654
+    return any(invalid_player_name_pattern.search(name) for name in players)
+
+
+class BanlistMatcher:
+    """Aho-Corasick automaton that finds any banned word in a single pass over a name."""
+
+    def __init__(self, words: Iterable[str]) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._match: List[bool] = [False]
+        for word in words:
+            state = 0
+            for char in word:
+                nextState = self._goto[state].get(char)
+                if nextState is None:
+                    nextState = len(self._goto)
+                    self._goto[state][char] = nextState
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._match.append(False)
+                state = nextState
+            self._match[state] = True
+
+        # breadth-first, so every failure link a state depends on is already resolved
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nextState in self._goto[state].items():
+                queue.append(nextState)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nextState] = self._goto[fail].get(char, 0)
+                self._match[nextState] = self._match[nextState] or self._match[self._fail[nextState]]
+
+    def search(self, text: str) -> bool:
+        goto = self._goto
+        fail = self._fail
+        match = self._match
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if match[state]:
                 return True
+        return False
+
+
+# keyed by path, modification time and size so edits to the banlist are picked up without re-reading it every time
+banlist_matcher_cache: Dict[Tuple[str, int, int], BanlistMatcher] = {}
 
-    return False
+
+def load_banlist_matcher(path: str) -> BanlistMatcher:
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    matcher = banlist_matcher_cache.get(key)
+    if matcher is None:
+        with open(path, 'r') as ban_list_file:
+            words = set([line.strip().upper() for line in ban_list_file.read().split('\n') if line.strip()])
+        matcher = BanlistMatcher(words)
+        banlist_matcher_cache.clear()
+        banlist_matcher_cache[key] = matcher
+    return matcher
 
 
 def any_player_name_contains_a_banned_word(players: List[str]) -> bool:
     if config['banlist_file'] != '':
         try:
-            with open(config['banlist_file'], 'r') as ban_list_file:
-                words = set([line.strip().upper() for line in ban_list_file.read().split('\n') if line.strip()])
-
-                for name in players:
-                    for word in words:
-                        if word in name.upper():
-                            return True
+            matcher = load_banlist_matcher(config['banlist_file'])
         except:
             logger.warning('Unable to load banlist file')
+            return False
+
+        return any(matcher.search(name.upper()) for name in players)
 
     return False
 
@@ -12,6 +12,9 @@ Requirements:
 
 - Internet connectivity is required to reach ZeroTier infrastructure
 - First run may take longer as ZeroTier establishes network identity
+- Optional: on Linux, installing inotify_simple lets the tool react as soon as
+  the game list is written instead of polling for it
+- Optional: installing orjson speeds up decoding and --json output
 
 The tool will timeout after 25 seconds by default if no games are found.
 This can happen if:
@@ -22,13 +25,26 @@ This can happen if:
 
 import argparse
 import json
+import os
+import selectors
 import signal
 import subprocess
 import sys
 import tempfile
+import threading
 import time
 from pathlib import Path
-from typing import Any
+from typing import IO, Any, Callable
+
+try:
+    from inotify_simple import INotify, flags  # type: ignore[import-untyped]
+except ImportError:
+    INotify = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
 
 
 GAME_TYPES = {
@@ -43,50 +59,157 @@ GAME_TYPES = {
     "HWKD": "modHellfire",
 }
 
-DIFFICULTIES = ["Normal", "Nightmare", "Hell"]
+DIFFICULTIES = {
+    0: "Normal",
+    1: "Nightmare",
+    2: "Hell",
+}
+
+SPEED_BY_TICK = {
+    20: "",
+    30: " Fast",
+    40: " Faster",
+    50: " Fastest",
+    None: "",
+}
+
+# Attribute suffixes for every combination of flags, indexed by a bitmask
+# with bit 0 for RiT through bit 4 for FF
+ATTRIBUTE_NAMES = ("RiT", "Quests", "Theo", "Cow", "FF")
+ATTRIBUTE_SUFFIXES = tuple(
+    f" ({', '.join(name for bit, name in enumerate(ATTRIBUTE_NAMES) if mask >> bit & 1)})" if mask else ""
+    for mask in range(1 << len(ATTRIBUTE_NAMES))
+)
+
+
+def make_formatter(raw_type: str, verbose: bool) -> Callable[[dict[str, Any]], str]:
+    """Build a formatter with everything that depends only on game type and verbosity resolved."""
+    game_type = GAME_TYPES.get(raw_type, raw_type)
+    # Diablo has no Theo or Cow quest, so those flags are ignored for it
+    has_extra_quests = raw_type != "DRTL"
+
+    def format_entry(game: dict[str, Any]) -> str:
+        game_id = str(game.get("id", "???")).upper()
+        version = game.get("version", "?")
+        difficulty = DIFFICULTIES.get(game.get("difficulty", -1), "?")
+        players = game.get("players", [])
+        assert isinstance(players, list)
+        # The binary always writes names as strings, and join rejects anything else itself
+        player_list = ", ".join(players)
+
+        attr_mask = (bool(game.get("run_in_town"))
+                     | bool(game.get("full_quests")) << 1
+                     | (has_extra_quests and bool(game.get("theo_quest"))) << 2
+                     | (has_extra_quests and bool(game.get("cow_quest"))) << 3
+                     | bool(game.get("friendly_fire")) << 4)
+
+        tick_rate = game.get("tick_rate", 20)
+        speed = SPEED_BY_TICK.get(tick_rate)
+        if speed is None:
+            speed = f" speed:{tick_rate}"
+
+        attr_str = ATTRIBUTE_SUFFIXES[attr_mask]
+        line = f"{game_id}: {game_type} {version}{speed} {difficulty}{attr_str} - {player_list}"
+
+        if verbose:
+            line += f" [{game.get('address', '?')}]"
+
+        return line
+
+    return format_entry
+
+
+FORMATTERS: dict[tuple[str, bool], Callable[[dict[str, Any]], str]] = {}
 
 
 def format_game(game: dict[str, Any], verbose: bool = False) -> str:
     """Format a game entry as a human-readable line."""
-    game_id = str(game.get("id", "???")).upper()
-    game_type = GAME_TYPES.get(str(game.get("type", "")), str(game.get("type", "???")))
-    version = game.get("version", "?")
-    diff_val = game.get("difficulty")
-    difficulty = DIFFICULTIES[int(diff_val)] if diff_val in (0, 1, 2) else "?"
-    players = game.get("players", [])
-    assert isinstance(players, list)
-    player_list = ", ".join(str(p) for p in players)
-
-    attrs = []
-    if game.get("run_in_town"):
-        attrs.append("RiT")
-    if game.get("full_quests"):
-        attrs.append("Quests")
-    if game.get("theo_quest") and game.get("type") != "DRTL":
-        attrs.append("Theo")
-    if game.get("cow_quest") and game.get("type") != "DRTL":
-        attrs.append("Cow")
-    if game.get("friendly_fire"):
-        attrs.append("FF")
-
-    tick_rate = game.get("tick_rate", 20)
-    speed = ""
-    if tick_rate == 30:
-        speed = " Fast"
-    elif tick_rate == 40:
-        speed = " Faster"
-    elif tick_rate == 50:
-        speed = " Fastest"
-    elif tick_rate not in (20, None):
-        speed = f" speed:{tick_rate}"
-
-    attr_str = f" ({', '.join(attrs)})" if attrs else ""
-    line = f"{game_id}: {game_type} {version}{speed} {difficulty}{attr_str} - {player_list}"
-
-    if verbose:
-        line += f" [{game.get('address', '?')}]"
-
-    return line
+    key = (game.get("type") or "???", verbose)
+    formatter = FORMATTERS.get(key)
+    if formatter is None:
+        formatter = FORMATTERS[key] = make_formatter(*key)
+    return formatter(game)
+
+
+def watch_directory(path: str) -> Any:
+    """Watch path for finished writes, or return None if inotify isn't usable."""
+    if INotify is None:
+        return None
+    # Either call fails once the per-user inotify instance or watch limit is
+    # exhausted, in which case the caller falls back to polling
+    try:
+        inotify = INotify()
+    except OSError:
+        return None
+    try:
+        inotify.add_watch(path, flags.CLOSE_WRITE | flags.MOVED_TO)
+    except OSError:
+        inotify.close()
+        return None
+    return inotify
+
+
+def drain(stream: IO[bytes], chunks: list[bytes]) -> None:
+    """Collect everything written to stream until the other end closes it."""
+    for line in stream:
+        chunks.append(line)
+
+
+# How often the output file is checked when no inotify watch is available
+POLL_INTERVAL = 0.5
+
+
+def output_written(output_file: str) -> bool:
+    """Check for the game list, giving the binary a moment to finish writing it once it appears."""
+    if not os.path.exists(output_file):
+        return False
+    time.sleep(1)
+    return True
+
+
+def poll_for_output(proc: subprocess.Popen[bytes], output_file: str, timeout: int) -> None:
+    """Poll until the binary has written the game list, exited, or timed out."""
+    start = time.time()
+    while time.time() - start < timeout:
+        # Check if process died unexpectedly
+        if proc.poll() is not None:
+            break
+        if output_written(output_file):
+            break
+        time.sleep(POLL_INTERVAL)
+
+
+def wait_for_output(proc: subprocess.Popen[bytes], output_file: str, timeout: int,
+                    inotify: Any = None) -> None:
+    """Block until the binary has written the game list, exited, or timed out."""
+    try:
+        pidfd = os.pidfd_open(proc.pid)
+    except (AttributeError, OSError):
+        # No pidfd support on this platform or kernel
+        poll_for_output(proc, output_file, timeout)
+        return
+
+    # Process exit is delivered through the pidfd and, with inotify, the
+    # finished write (CLOSE_WRITE) through the watch, so neither is polled
+    output_name = os.path.basename(output_file)
+    try:
+        with selectors.DefaultSelector() as sel:
+            sel.register(pidfd, selectors.EVENT_READ, "exit")
+            if inotify is not None:
+                sel.register(inotify, selectors.EVENT_READ, "output")
+            deadline = time.monotonic() + timeout
+            while (remaining := deadline - time.monotonic()) > 0:
+                if inotify is None:
+                    if output_written(output_file):
+                        return
+                    remaining = min(remaining, POLL_INTERVAL)
+                for key, _ in sel.select(remaining):
+                    if key.data == "exit":
+                        return
+                    if any(event.name == output_name for event in inotify.read(timeout=0)):
+                        return
+    finally:
+        os.close(pidfd)
 
 
 def main() -> int:
@@ -105,38 +228,40 @@ def main() -> int:
         return 1
 
     with tempfile.TemporaryDirectory() as tmpdir:
-        output_file = Path(tmpdir) / "gamelist.json"
-        stderr_file = Path(tmpdir) / "stderr.log"
+        output_file = os.path.join(tmpdir, "gamelist.json")
+
+        inotify = None
+        proc: subprocess.Popen[bytes] | None = None
+        try:
+            # Watch before starting the binary so the write can't be missed
+            inotify = watch_directory(tmpdir)
 
-        with open(stderr_file, "w") as stderr_log:
             proc = subprocess.Popen(
-                [str(binary), str(output_file)],
+                [str(binary), output_file],
                 stdout=subprocess.DEVNULL,
-                stderr=stderr_log,
+                stderr=subprocess.PIPE,
             )
 
-        try:
-            start = time.time()
-            while time.time() - start < args.timeout:
-                # Check if process died unexpectedly
-                if proc.poll() is not None:
-                    break
-                if output_file.exists():
-                    time.sleep(1)  # Give it a moment to finish writing
-                    break
-                time.sleep(0.5)
+            # Keep the pipe drained so the binary never blocks on a full buffer
+            assert proc.stderr is not None
+            stderr_chunks: list[bytes] = []
+            stderr_reader = threading.Thread(target=drain, args=(proc.stderr, stderr_chunks), daemon=True)
+            stderr_reader.start()
+
+            wait_for_output(proc, output_file, args.timeout, inotify)
 
             # Check for early process termination
             if proc.poll() is not None and proc.returncode != 0:
-                stderr_content = stderr_file.read_text().strip()
+                stderr_reader.join(timeout=1)
+                stderr_content = b"".join(stderr_chunks).decode(errors="replace").strip()
                 print("Error: devilutionx-gamelist failed to start", file=sys.stderr)
                 if stderr_content:
                     print(stderr_content, file=sys.stderr)
                 return 1
 
-            if not output_file.exists():
+            if not os.path.exists(output_file):
                 if args.verbose:
-                    stderr_content = stderr_file.read_text().strip()
+                    stderr_content = b"".join(stderr_chunks).decode(errors="replace").strip()
                     if stderr_content:
                         print("--- Binary output ---", file=sys.stderr)
                         print(stderr_content, file=sys.stderr)
@@ -144,22 +269,31 @@ def main() -> int:
                 print("No games found (timeout waiting for network/games)", file=sys.stderr)
                 return 0
 
-            with open(output_file) as f:
-                data = json.load(f)
+            # The binary writes the whole list in one go, so a single parse of
+            # the raw bytes is cheaper than decoding through a text stream
+            with open(output_file, "rb") as f:
+                raw = f.read()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
 
             if args.json:
-                print(json.dumps(data, indent=2))
+                if orjson is not None:
+                    sys.stdout.buffer.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+                else:
+                    print(json.dumps(data, indent=2))
             else:
                 games = data.get("games", [])
                 if not games:
                     print("No active games")
                 else:
-                    print(f"Found {len(games)} game(s):\n")
-                    for game in games:
-                        print(format_game(game, args.verbose))
+                    lines = [f"Found {len(games)} game(s):\n"]
+                    lines.extend(format_game(game, args.verbose) for game in games)
+                    lines.append("")
+                    sys.stdout.write("\n".join(lines))
 
         finally:
-            if proc.poll() is None:
+            if inotify is not None:
+                inotify.close()
+            if proc is not None and proc.poll() is None:
                 proc.send_signal(signal.SIGTERM)
                 try:
                     proc.wait(timeout=5)
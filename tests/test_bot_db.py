@@ -1,4 +1,3 @@
-import pathlib
 import pytest
 import pytest_asyncio
 from collections.abc import AsyncGenerator
@@ -7,6 +6,14 @@ from ipaddress import IPv6Address
 from bot_db import BotDatabase, adapt_datetime_iso
 
 
+# The schema is created once per module and TestBotDatabase empties the tables after each test
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def db(tmp_path_factory: pytest.TempPathFactory) -> AsyncGenerator[BotDatabase, None]:
+    db_path = str(tmp_path_factory.mktemp("db") / "test.db")
+    async with BotDatabase(db_path) as db:
+        yield db
+
+
 class TestAdaptDatetimeIso:
     def test_converts_datetime_to_iso_string(self) -> None:
         dt = datetime(2024, 1, 15, 10, 30, 45, tzinfo=UTC)
@@ -21,13 +28,18 @@ class TestAdaptDatetimeIso:
 
 
 class TestBotDatabase:
-    @pytest_asyncio.fixture
-    async def db(self, tmp_path: pathlib.Path) -> AsyncGenerator[BotDatabase, None]:
-        db_path = str(tmp_path / "test.db")
-        async with BotDatabase(db_path) as db:
-            yield db
+    # Every test shares the module-scoped db fixture, so it must run on the module-scoped event loop.
+    # Marked on the class rather than the module because TestAdaptDatetimeIso is synchronous.
+    pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+    @pytest_asyncio.fixture(autouse=True, loop_scope="module")
+    async def empty_tables(self, db: BotDatabase) -> AsyncGenerator[None, None]:
+        yield
+        async with db._db.cursor() as cursor:
+            for table in ("MemberSighting", "PlayerSighting", "ZeroTierMember", "IPBan"):
+                await cursor.execute(f"DELETE FROM {table}")
+        await db._db.commit()
 
-    @pytest.mark.asyncio
     async def test_save_and_find_player_by_name(self, db: BotDatabase) -> None:
         ipv6 = IPv6Address("fd00::abcd:1234:5678")
         now = datetime.now(UTC).replace(tzinfo=None)
@@ -37,7 +49,6 @@ class TestBotDatabase:
         assert len(results) == 1
         assert "TestPlayer" in results[0]
 
-    @pytest.mark.asyncio
     async def test_find_player_case_insensitive(self, db: BotDatabase) -> None:
         ipv6 = IPv6Address("fd00::abcd:1234:5678")
         now = datetime.now(UTC).replace(tzinfo=None)
@@ -46,12 +57,10 @@ class TestBotDatabase:
         results = await db.find_player_by_name("testplayer")
         assert len(results) == 1
 
-    @pytest.mark.asyncio
     async def test_find_player_not_found(self, db: BotDatabase) -> None:
         results = await db.find_player_by_name("NonExistent")
         assert len(results) == 0
 
-    @pytest.mark.asyncio
     async def test_save_and_find_game_by_name(self, db: BotDatabase) -> None:
         now = datetime.now(UTC).replace(tzinfo=None)
         await db.save_player_sighting("PlayerOne", "TestGame", now)
@@ -60,7 +69,6 @@ class TestBotDatabase:
         assert len(results) == 1
         assert "PlayerOne" in results[0]
 
-    @pytest.mark.asyncio
     async def test_player_sighting_updates_last_time(self, db: BotDatabase) -> None:
         first = datetime.now(UTC).replace(tzinfo=None)
         await db.save_player_sighting("Player", "Game", first)
@@ -72,7 +80,6 @@ class TestBotDatabase:
         # Should have 2 results (first and last timestamps)
         assert len(results) == 2
 
-    @pytest.mark.asyncio
     async def test_save_and_find_zt_member(self, db: BotDatabase) -> None:
         now = datetime.now(UTC).replace(tzinfo=None)
         await db.save_zt_member("abc123", "192.168.1.1", now, "allowed")
@@ -82,12 +89,10 @@ class TestBotDatabase:
         assert "192.168.1.1" in result
         assert "allowed" in result
 
-    @pytest.mark.asyncio
     async def test_find_zt_member_not_found(self, db: BotDatabase) -> None:
         result = await db.find_zt_member_by_id("nonexistent")
         assert result == ""
 
-    @pytest.mark.asyncio
     async def test_zt_member_without_ip(self, db: BotDatabase) -> None:
         now = datetime.now(UTC).replace(tzinfo=None)
         await db.save_zt_member("abc123", "", now, "allowed")
@@ -96,7 +101,6 @@ class TestBotDatabase:
         assert "abc123" in result
         assert "192.168" not in result
 
-    @pytest.mark.asyncio
     async def test_list_zt_members(self, db: BotDatabase) -> None:
         now = datetime.now(UTC).replace(tzinfo=None)
         await db.save_zt_member("member1", "10.0.0.1", now, "allowed")
@@ -105,7 +109,6 @@ class TestBotDatabase:
         members = await db.list_zt_members()
         assert len(members) == 2
 
-    @pytest.mark.asyncio
     async def test_old_zt_member_not_saved(self, db: BotDatabase) -> None:
         old_date = datetime.now(UTC).replace(tzinfo=None) - timedelta(days=31)
         await db.save_zt_member("oldmember", "10.0.0.1", old_date, "allowed")
@@ -113,7 +116,6 @@ class TestBotDatabase:
         result = await db.find_zt_member_by_id("oldmember")
         assert result == ""
 
-    @pytest.mark.asyncio
     async def test_ban_and_list_bans(self, db: BotDatabase) -> None:
         await db.ban("192.168.1.100")
 
@@ -121,7 +123,6 @@ class TestBotDatabase:
         assert len(bans) == 1
         assert "192.168.1.100" in bans[0]
 
-    @pytest.mark.asyncio
     async def test_remove_ban(self, db: BotDatabase) -> None:
         await db.ban("192.168.1.100")
         await db.remove_ban("192.168.1.100")
@@ -129,7 +130,6 @@ class TestBotDatabase:
         bans = await db.list_bans()
         assert len(bans) == 0
 
-    @pytest.mark.asyncio
     async def test_find_members_to_block(self, db: BotDatabase) -> None:
         now = datetime.now(UTC).replace(tzinfo=None)
         await db.save_zt_member("member1", "192.168.1.100", now, "allowed")
@@ -138,7 +138,6 @@ class TestBotDatabase:
         to_block = await db.find_members_to_block()
         assert "member1" in to_block
 
-    @pytest.mark.asyncio
     async def test_already_blocked_not_in_find_members_to_block(self, db: BotDatabase) -> None:
         now = datetime.now(UTC).replace(tzinfo=None)
         await db.save_zt_member("member1", "192.168.1.100", now, "blocked")
@@ -147,7 +146,6 @@ class TestBotDatabase:
         to_block = await db.find_members_to_block()
         assert "member1" not in to_block
 
-    @pytest.mark.asyncio
     async def test_clean_up_removes_old_sightings(self, db: BotDatabase) -> None:
         old = datetime.now(UTC).replace(tzinfo=None) - timedelta(days=15)
         ipv6 = IPv6Address("fd00::abcd:1234:5678")
@@ -158,7 +156,6 @@ class TestBotDatabase:
         results = await db.find_player_by_name("OldPlayer")
         assert len(results) == 0
 
-    @pytest.mark.asyncio
     async def test_clean_up_keeps_recent_sightings(self, db: BotDatabase) -> None:
         recent = datetime.now(UTC).replace(tzinfo=None) - timedelta(days=1)
         ipv6 = IPv6Address("fd00::abcd:1234:5678")
@@ -1,5 +1,7 @@
+import discord_bot
 import pathlib
 import pytest
+from typing import Any
 from discord_bot import (
     escape_discord_formatting_characters,
     format_game_message,
@@ -229,6 +231,56 @@ class TestFormatGameMessage:
         assert "Bob" in result
         assert "Charlie" in result
 
+    def test_player_change_is_rendered(self) -> None:
+        game = {
+            "id": "changegame",
+            "type": "DRTL",
+            "version": "1.5.0",
+            "tick_rate": 20,
+            "difficulty": 0,
+            "run_in_town": False,
+            "full_quests": False,
+            "theo_quest": False,
+            "cow_quest": False,
+            "friendly_fire": False,
+            "players": ["Alice"],
+            "timestamp": 1700000000,
+        }
+        first = format_game_message(game)
+        game["players"] = ["Alice", "Bob"]
+        second = format_game_message(game)
+        assert "Bob" not in first
+        assert "Bob" in second
+        assert format_game_message(game) == second
+
+    def test_unchanged_game_is_not_rendered_again(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        game = {
+            "id": "cachedgame",
+            "type": "DRTL",
+            "version": "1.5.0",
+            "tick_rate": 20,
+            "difficulty": 0,
+            "run_in_town": False,
+            "full_quests": False,
+            "theo_quest": False,
+            "cow_quest": False,
+            "friendly_fire": False,
+            "players": ["Alice"],
+            "timestamp": 1700000000,
+        }
+        calls = []
+        render = discord_bot._format_game_message
+
+        def counting_render(game: dict[str, Any]) -> str:
+            calls.append(game["id"])
+            return render(game)
+
+        monkeypatch.setattr(discord_bot, "_format_game_message", counting_render)
+        first = format_game_message(game)
+        second = format_game_message(dict(game))
+        assert first == second
+        assert len(calls) == 1
+
 
 class TestAnyPlayerNameIsInvalid:
     def test_valid_names(self) -> None:
@@ -323,3 +375,35 @@ class TestAnyPlayerNameContainsBannedWord:
         result = any_player_name_contains_a_banned_word(["goodplayer"])
         config["banlist_file"] = original
         assert result is False
+
+    def test_banlist_change_is_picked_up(self, tmp_path: pathlib.Path) -> None:
+        banlist = tmp_path / "banlist"
+        banlist.write_text("badword\n")
+        original = config["banlist_file"]
+        config["banlist_file"] = str(banlist)
+        before = any_player_name_contains_a_banned_word(["xnewwordx"])
+        banlist.write_text("badword\nnewword\n")
+        after = any_player_name_contains_a_banned_word(["xnewwordx"])
+        config["banlist_file"] = original
+        assert before is False
+        assert after is True
+
+    def test_banned_word_is_matched_literally(self, tmp_path: pathlib.Path) -> None:
+        banlist = tmp_path / "banlist"
+        banlist.write_text("b.d\n")
+        original = config["banlist_file"]
+        config["banlist_file"] = str(banlist)
+        literal = any_player_name_contains_a_banned_word(["xb.dx"])
+        wildcard = any_player_name_contains_a_banned_word(["xbadx"])
+        config["banlist_file"] = original
+        assert literal is True
+        assert wildcard is False
+
+    def test_banned_word_overlapping_another_prefix(self, tmp_path: pathlib.Path) -> None:
+        banlist = tmp_path / "banlist"
+        banlist.write_text("abcd\nbce\n")
+        original = config["banlist_file"]
+        config["banlist_file"] = str(banlist)
+        result = any_player_name_contains_a_banned_word(["xabcex"])
+        config["banlist_file"] = original
+        assert result is True
@@ -0,0 +1,210 @@
+import errno
+import gamelist_cli
+import os
+import pathlib
+import pytest
+import sys
+import time
+from typing import Any, NoReturn
+from gamelist_cli import format_game, main, watch_directory
+
+
+def make_game(**overrides: Any) -> dict[str, Any]:
+    game: dict[str, Any] = {
+        "id": "testgame",
+        "address": "fd00::1",
+        "seed": 1234,
+        "type": "HRTL",
+        "version": "1.5.0",
+        "difficulty": 0,
+        "tick_rate": 20,
+        "run_in_town": False,
+        "theo_quest": False,
+        "cow_quest": False,
+        "friendly_fire": False,
+        "full_quests": False,
+        "players": ["Alice", "Bob"],
+    }
+    game.update(overrides)
+    return game
+
+
+class TestFormatGame:
+    def test_basic_game(self) -> None:
+        assert format_game(make_game()) == "TESTGAME: Hellfire 1.5.0 Normal - Alice, Bob"
+
+    def test_unknown_type_shown_as_is(self) -> None:
+        assert format_game(make_game(type="XXXX")) == "TESTGAME: XXXX 1.5.0 Normal - Alice, Bob"
+
+    def test_speed_table_hit(self) -> None:
+        assert format_game(make_game(tick_rate=40)) == "TESTGAME: Hellfire 1.5.0 Faster Normal - Alice, Bob"
+
+    def test_speed_table_miss(self) -> None:
+        assert format_game(make_game(tick_rate=25)) == "TESTGAME: Hellfire 1.5.0 speed:25 Normal - Alice, Bob"
+
+    def test_missing_tick_rate_is_normal_speed(self) -> None:
+        game = make_game()
+        del game["tick_rate"]
+        assert format_game(game) == "TESTGAME: Hellfire 1.5.0 Normal - Alice, Bob"
+
+    def test_difficulty_names(self) -> None:
+        assert " Nightmare " in format_game(make_game(difficulty=1))
+        assert " Hell " in format_game(make_game(difficulty=2))
+
+    def test_difficulty_out_of_range(self) -> None:
+        assert format_game(make_game(difficulty=3)) == "TESTGAME: Hellfire 1.5.0 ? - Alice, Bob"
+
+    def test_diablo_drops_theo_and_cow(self) -> None:
+        game = make_game(type="DRTL", theo_quest=True, cow_quest=True, run_in_town=True)
+        assert format_game(game) == "TESTGAME: Diablo 1.5.0 Normal (RiT) - Alice, Bob"
+
+    def test_hellfire_keeps_theo_and_cow(self) -> None:
+        game = make_game(theo_quest=True, cow_quest=True)
+        assert format_game(game) == "TESTGAME: Hellfire 1.5.0 Normal (Theo, Cow) - Alice, Bob"
+
+    def test_verbose_appends_address(self) -> None:
+        assert format_game(make_game(), verbose=True) == "TESTGAME: Hellfire 1.5.0 Normal - Alice, Bob [fd00::1]"
+
+    def test_verbose_missing_address(self) -> None:
+        game = make_game()
+        del game["address"]
+        assert format_game(game, verbose=True).endswith(" [?]")
+
+    def test_verbose_does_not_leak_into_plain_format(self) -> None:
+        format_game(make_game(), verbose=True)
+        assert format_game(make_game()) == "TESTGAME: Hellfire 1.5.0 Normal - Alice, Bob"
+
+    def test_flag_combination(self) -> None:
+        game = make_game(run_in_town=True, full_quests=True, friendly_fire=True)
+        assert format_game(game) == "TESTGAME: Hellfire 1.5.0 Normal (RiT, Quests, FF) - Alice, Bob"
+
+    def test_all_flags(self) -> None:
+        game = make_game(run_in_town=True, full_quests=True, theo_quest=True, cow_quest=True, friendly_fire=True)
+        assert format_game(game) == "TESTGAME: Hellfire 1.5.0 Normal (RiT, Quests, Theo, Cow, FF) - Alice, Bob"
+
+    def test_missing_flags_are_unset(self) -> None:
+        game = make_game()
+        for flag in ("run_in_town", "theo_quest", "cow_quest", "friendly_fire", "full_quests"):
+            del game[flag]
+        assert format_game(game) == "TESTGAME: Hellfire 1.5.0 Normal - Alice, Bob"
+
+
+GAME_LIST = (
+    '{"games": [{"id": "testgame", "type": "HRTL", "version": "1.5.0", "difficulty": 1, '
+    '"tick_rate": 30, "players": ["Alice"]}], "player_sightings": []}'
+)
+
+
+def make_binary(tmp_path: pathlib.Path, script: str) -> str:
+    binary = tmp_path / "devilutionx-gamelist"
+    binary.write_text("#!/bin/sh\n" + script)
+    binary.chmod(0o755)
+    return str(binary)
+
+
+def run_main(monkeypatch: pytest.MonkeyPatch, *args: str) -> int:
+    monkeypatch.setattr(sys, "argv", ["gamelist_cli.py", *args])
+    return main()
+
+
+def no_pidfd(pid: int) -> NoReturn:
+    raise OSError(errno.ENOSYS, "pidfd_open")
+
+
+@pytest.fixture(params=["inotify", "pidfd", "poll"])
+def wait_mode(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    mode: str = request.param
+    if mode == "inotify":
+        if getattr(gamelist_cli, "INotify") is None:
+            pytest.skip("inotify_simple is not installed")
+    elif mode == "pidfd":
+        monkeypatch.setattr(gamelist_cli, "INotify", None)
+    else:
+        # What main sees when inotify setup failed and pidfds aren't supported
+        monkeypatch.setattr(gamelist_cli, "watch_directory", lambda path: None)
+        monkeypatch.setattr(os, "pidfd_open", no_pidfd)
+    return mode
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses shell scripts as the binary")
+class TestMain:
+    def test_prints_games(self, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch,
+                          capsys: pytest.CaptureFixture[str], wait_mode: str) -> None:
+        binary = make_binary(tmp_path, f"printf '%s' '{GAME_LIST}' > \"$1\"\nexec sleep 30\n")
+        start = time.monotonic()
+        result = run_main(monkeypatch, "--binary", binary, "-t", "5")
+        elapsed = time.monotonic() - start
+        assert result == 0
+        assert capsys.readouterr().out == "Found 1 game(s):\n\nTESTGAME: Hellfire 1.5.0 Fast Nightmare - Alice\n"
+        if wait_mode == "inotify":
+            # CLOSE_WRITE replaces the fixed 1s wait for the write to finish
+            assert elapsed < 0.9
+
+    def test_no_active_games(self, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch,
+                             capsys: pytest.CaptureFixture[str], wait_mode: str) -> None:
+        binary = make_binary(tmp_path, "printf '%s' '{\"games\": []}' > \"$1\"\nexec sleep 30\n")
+        assert run_main(monkeypatch, "--binary", binary, "-t", "5") == 0
+        assert capsys.readouterr().out == "No active games\n"
+
+    def test_timeout(self, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch,
+                     capsys: pytest.CaptureFixture[str], wait_mode: str) -> None:
+        binary = make_binary(tmp_path, "exec sleep 30\n")
+        start = time.monotonic()
+        result = run_main(monkeypatch, "--binary", binary, "-t", "1")
+        elapsed = time.monotonic() - start
+        assert result == 0
+        assert capsys.readouterr().err == "No games found (timeout waiting for network/games)\n"
+        assert elapsed < 3
+
+
+    def test_failed_start_prints_stderr(self, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch,
+                                        capsys: pytest.CaptureFixture[str], wait_mode: str) -> None:
+        binary = make_binary(tmp_path, "echo boom >&2\nexit 3\n")
+        assert run_main(monkeypatch, "--binary", binary, "-t", "5") == 1
+        assert capsys.readouterr().err == "Error: devilutionx-gamelist failed to start\nboom\n"
+
+    def test_verbose_timeout_prints_binary_output(self, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch,
+                                                  capsys: pytest.CaptureFixture[str], wait_mode: str) -> None:
+        binary = make_binary(tmp_path, "echo still connecting >&2\nexec sleep 30\n")
+        assert run_main(monkeypatch, "--binary", binary, "-t", "1", "-v") == 0
+        assert capsys.readouterr().err == (
+            "--- Binary output ---\n"
+            "still connecting\n"
+            "---\n"
+            "No games found (timeout waiting for network/games)\n"
+        )
+
+
+class TestWatchDirectory:
+    def test_returns_none_without_inotify(self, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(gamelist_cli, "INotify", None)
+        assert watch_directory(str(tmp_path)) is None
+
+    def test_returns_none_when_instance_limit_reached(self, tmp_path: pathlib.Path,
+                                                      monkeypatch: pytest.MonkeyPatch) -> None:
+        def exhausted() -> NoReturn:
+            raise OSError(errno.EMFILE, "inotify_init1")
+
+        monkeypatch.setattr(gamelist_cli, "INotify", exhausted)
+        assert watch_directory(str(tmp_path)) is None
+
+    def test_closes_instance_when_watch_limit_reached(self, tmp_path: pathlib.Path,
+                                                      monkeypatch: pytest.MonkeyPatch) -> None:
+        instances = []
+
+        class ExhaustedWatches:
+            closed = False
+
+            def __init__(self) -> None:
+                instances.append(self)
+
+            def add_watch(self, path: str, mask: int) -> NoReturn:
+                raise OSError(errno.ENOSPC, "inotify_add_watch")
+
+            def close(self) -> None:
+                self.closed = True
+
+        monkeypatch.setattr(gamelist_cli, "INotify", ExhaustedWatches)
+        monkeypatch.setattr(gamelist_cli, "flags", type("flags", (), {"CLOSE_WRITE": 8, "MOVED_TO": 128}), raising=False)
+        assert watch_directory(str(tmp_path)) is None
+        assert instances[0].closed